@@ -9,13 +9,14 @@ __version__ = "1.0.0"
 __author__ = "Sentinel Team"
 
 from .scanner import CodeScanner
-from .analyzer import CodeAnalyzer
+from .analyzer import AnalysisResult, CodeAnalyzer
 from .reporter import ReportGenerator
 from .github_pusher import GitHubPusher
 
 __all__ = [
     'CodeScanner',
     'CodeAnalyzer',
+    'AnalysisResult',
     'ReportGenerator',
     'GitHubPusher',
 ]
@@ -1,19 +1,35 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import List, Optional, Tuple
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import asyncio
+import hashlib
+import io
+import json
 import logging
+import re
+import sqlite3
+import threading
+import tokenize
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
 import os
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
 genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
 
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = 'gemini-2.5-flash-lite'
+DEFAULT_CACHE_PATH = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'sentinel' / 'analyses.sqlite'
+CACHE_TTL_SECONDS = int(os.getenv('SENTINEL_CACHE_TTL', '3600'))
 
-class CodeAnalyzer:
-    
-    def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
-        self.system_instruction = """You are a Security Sentinel Code Reviewer — an expert security analyst and code reviewer.
+SYSTEM_INSTRUCTION = """You are a Security Sentinel Code Reviewer — an expert security analyst and code reviewer.
 When provided with source code, analyze it thoroughly and provide:
 
 1. **Security Vulnerabilities**: Identify critical security issues such as:
@@ -60,60 +76,760 @@ For each issue, specify:
 - How to fix it
 
 If the code is secure and well-written, acknowledge that and provide positive feedback.
-Be thorough, educational, and constructive."""
+Be thorough, educational, and constructive.
+
+## Severity definitions
+
+Assign exactly one severity to every issue, using the highest level that applies:
+- CRITICAL: Exploitable by an attacker with no special access and leads to remote code
+  execution, authentication bypass, arbitrary file read/write, or disclosure of secrets or
+  personal data. Examples: user input reaching eval/exec, shell commands built from request
+  parameters, SQL built by string concatenation from request data, hardcoded production
+  credentials, pickle/yaml.load on untrusted data, disabled TLS certificate verification in
+  code that talks to external services.
+- HIGH: A real security weakness that needs an additional condition to exploit, or a bug that
+  will corrupt data, crash the program or leak resources under normal use. Examples: weak
+  hashing (MD5/SHA-1) for passwords, predictable random values used as tokens, missing
+  authorization checks on sensitive operations, unbounded reads of user-controlled sizes,
+  race conditions on shared files, swallowed exceptions around security checks.
+- MEDIUM: Code quality problems that make defects likely or hide them. Examples: bare or
+  overly broad except clauses, mutable default arguments, unclosed files or connections
+  outside a context manager, global mutable state, functions with many responsibilities,
+  missing validation of internal inputs, logging of sensitive values at debug level.
+- LOW: Style and maintainability suggestions with no direct impact on correctness. Examples:
+  naming, missing type hints, unused imports, redundant code, missing docstrings on public
+  APIs, small readability improvements.
+
+Do not inflate severities: an issue that cannot be reached from untrusted input is not
+CRITICAL. Do not report the same root cause more than once; list all affected lines on a
+single issue instead. Do not report issues in code you cannot see (for example in imported
+modules) and do not invent line numbers; omit the line number if it is not identifiable.
+
+## Review checklist
+
+Work through the following checks for every file, in this order:
+1. Entry points: find where external input enters (HTTP handlers, CLI arguments, environment
+   variables, files, sockets, message queues, deserialized data) and follow it to sinks.
+2. Injection sinks: SQL queries, shell commands, eval/exec, template rendering, LDAP/XPath
+   queries, file paths, URLs fetched by the server (SSRF), regular expressions built from
+   input (ReDoS), and HTML output (XSS). Parameterized APIs and allow-lists are safe.
+3. Secrets and cryptography: hardcoded keys, tokens or passwords; homemade crypto; ECB
+   mode; static IVs or salts; insecure random number generators for security purposes;
+   certificate or hostname verification turned off.
+4. Authentication and authorization: missing or inconsistent permission checks, insecure
+   session handling, CSRF protection disabled, credentials compared with non-constant-time
+   comparisons, overly permissive CORS settings.
+5. Data handling: unsafe deserialization (pickle, marshal, yaml.load, Java object streams,
+   PHP unserialize), XML parsers with external entities enabled, archive extraction without
+   path checks (zip slip), temporary files created insecurely.
+6. Error handling and resources: swallowed exceptions, errors that leak stack traces or
+   internals to users, files, sockets, locks and database connections that are not released
+   on every path, retries without limits.
+7. Concurrency: shared state mutated from several threads or tasks without locking,
+   check-then-act races on the file system, blocking calls inside async code.
+8. Code quality: dead code, unused variables and imports, duplicated logic, very long or
+   deeply nested functions, misleading names, missing type hints for public functions.
+
+Language-specific points to keep in mind:
+- Python: subprocess with shell=True, os.system, assert used for validation, pickle,
+  yaml.load without SafeLoader, tempfile.mktemp, requests with verify=False.
+- JavaScript/TypeScript: innerHTML and dangerouslySetInnerHTML, eval and new Function,
+  child_process.exec, prototype pollution through object merging, missing await.
+- Java/Kotlin/Scala/C#: string-built queries, ObjectInputStream/BinaryFormatter, XML
+  parsers without secure processing, broad catch of Exception/Throwable.
+- C/C++: buffer overflows, unchecked return values, format string bugs, use after free,
+  integer overflow in size calculations, strcpy/sprintf/gets.
+- Go/Rust: ignored errors, unsafe blocks, unchecked type assertions, goroutine leaks.
+- PHP/Ruby: include/require of user paths, unserialize/Marshal.load on input, mass
+  assignment, system/backticks with interpolated input.
+
+## Report format
+
+Structure the analysis of each file as follows, using Markdown:
+
+### Summary
+One or two sentences describing what the file does and its overall quality.
+
+### Issues
+One entry per issue, ordered from most to least severe:
+
+**[SEVERITY] Short title** (line N or lines N-M)
+- Problem: what is wrong.
+- Risk: why it is dangerous or problematic.
+- Fix: how to fix it, with a short corrected code snippet where it helps.
+
+### Recommendations
+General improvements that do not belong to a single issue, if any.
+
+If there are no issues, say so under Issues and mention what the code does well.
+
+## Example
+
+For this Python code:
+```python
+import os
+def run(cmd=[]):
+    os.system("ls " + cmd)
+```
+a good analysis contains an issue such as:
+
+**[CRITICAL] Command injection through os.system** (line 3)
+- Problem: the argument is concatenated into a shell command.
+- Risk: a caller controlling cmd can run arbitrary shell commands.
+- Fix: use subprocess.run(["ls", cmd], check=True) without a shell.
+
+followed by a MEDIUM issue for the mutable default argument on line 2.
+
+Comments and docstrings may have been stripped from the code to save space, and very long
+string literals shortened; line numbers still match the original file.
+
+When a single request contains several files (each introduced as "### FILE <n>: <name>"),
+review every file independently and start the analysis of each file with a line containing
+only its delimiter, for example:
+=== SENTINEL FILE 1 ===
+Use the file numbers given in the request, cover every file exactly once, and do not write
+anything before the first delimiter."""
+
+BATCH_DELIMITER = "=== SENTINEL FILE {index} ==="
+_BATCH_SECTION_RE = re.compile(r'^=== SENTINEL FILE (\d+) ===[ \t]*$', re.MULTILINE)
+
+MAX_STRING_LITERAL = 200
+
+_C_STYLE_COMMENT_LANGUAGES = {
+    'Java', 'JavaScript', 'TypeScript', 'JavaScript React', 'TypeScript React',
+    'Go', 'PHP', 'C++', 'C', 'C#', 'Swift', 'Kotlin', 'Rust', 'Scala'
+}
+_HASH_COMMENT_LANGUAGES = {'Ruby', 'PHP'}
+
+_STRING_PATTERN = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`'
+_C_STYLE_COMMENT_RE = re.compile(rf'({_STRING_PATTERN})|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_HASH_COMMENT_RE = re.compile(rf'({_STRING_PATTERN})|#[^\n]*')
+
+MIN_CACHE_TOKENS = 1024
+PROMPT_DIGEST = hashlib.sha256(SYSTEM_INSTRUCTION.encode('utf-8')).hexdigest()[:12]
+CACHE_DISPLAY_NAME = f'sentinel-{PROMPT_DIGEST}'
+
+_cached_content = None
+_cache_supported = None
+_cache_lock = threading.Lock()
+
+
+def _strip_comments(content: str, pattern: re.Pattern) -> str:
+    """
+    Remove comments matched by pattern, leaving string literals (group 1) intact.
+    
+    Newlines inside removed comments are kept so line numbers do not move.
+    
+    Args:
+        content: Source code
+        pattern: Regex matching either a string literal (group 1) or a comment
+        
+    Returns:
+        Source code without comments
+    """
+    def replace(match):
+        if match.group(1) is not None:
+            return match.group(0)
+        return '\n' * match.group(0).count('\n')
+    
+    return pattern.sub(replace, content)
+
+
+def _strip_python(content: str) -> str:
+    """
+    Remove comments and docstrings from Python code and shorten long string literals.
+    
+    Removed text is replaced by nothing except its newlines, so line numbers do not move.
+    
+    Args:
+        content: Python source code
+        
+    Returns:
+        Compressed source code
+        
+    Raises:
+        tokenize.TokenError, IndentationError, SyntaxError: If the code cannot be tokenized
+    """
+    lines = io.StringIO(content).readlines()
+    edits = []
+    previous_type = tokenize.NEWLINE
+    pending_string = None
+    
+    for token in tokenize.generate_tokens(io.StringIO(content).readline):
+        if token.type == tokenize.COMMENT:
+            edits.append((token.start, token.end, ''))
+            continue
+        if token.type == tokenize.NL:
+            continue
+        
+        if pending_string is not None:
+            if token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                edits.append((pending_string.start, pending_string.end, ''))
+            elif pending_string.start[0] == pending_string.end[0] and len(pending_string.string) > MAX_STRING_LITERAL:
+                edits.append((pending_string.start, pending_string.end, _shorten_literal(pending_string.string)))
+            pending_string = None
+        
+        if token.type == tokenize.STRING:
+            if previous_type in (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT):
+                pending_string = token
+            elif token.start[0] == token.end[0] and len(token.string) > MAX_STRING_LITERAL:
+                edits.append((token.start, token.end, _shorten_literal(token.string)))
+        
+        previous_type = token.type
+    
+    for (start_row, start_col), (end_row, end_col), replacement in sorted(edits, reverse=True):
+        first = lines[start_row - 1]
+        last = lines[end_row - 1]
+        middle = '\n' * (end_row - start_row)
+        lines[start_row - 1:end_row] = [first[:start_col] + replacement + middle + last[end_col:]]
+    
+    return ''.join(lines)
+
+
+def _shorten_literal(literal: str) -> str:
+    """
+    Shorten a single-line string literal to about MAX_STRING_LITERAL characters.
+    
+    Args:
+        literal: String literal including prefix and quotes
+        
+    Returns:
+        Shortened literal that is still properly quoted
+    """
+    quote = literal[-3:] if literal.endswith(('\"\"\"', "\'\'\'")) else literal[-1]
+    return literal[:MAX_STRING_LITERAL] + '...' + quote
+
+
+def _instruction_is_cacheable() -> bool:
+    """
+    Check whether SYSTEM_INSTRUCTION meets the provider's minimum size for context caching.
+    
+    Instructions that are clearly too short (under MIN_CACHE_TOKENS even at
+    a pessimistic three characters per token) are rejected without an API
+    call; anything larger is confirmed with count_tokens.
+    
+    Returns:
+        True if a context cache can be created for the instruction
+    """
+    if len(SYSTEM_INSTRUCTION) < MIN_CACHE_TOKENS * 3:
+        return False
+    model = genai.GenerativeModel(MODEL_NAME)
+    return model.count_tokens(SYSTEM_INSTRUCTION).total_tokens >= MIN_CACHE_TOKENS
+
+
+def _find_cached_content():
+    """
+    Look up a live cache for the current instruction left behind by an earlier run.
+    
+    Returns:
+        CachedContent instance, or None if there is none
+    """
+    for cache in caching.CachedContent.list():
+        if cache.display_name == CACHE_DISPLAY_NAME and cache.model.endswith(MODEL_NAME):
+            return cache
+    return None
+
+
+def get_cached_content(expired=None):
+    """
+    Return the context cache holding the system instruction, creating it on first use.
+    
+    A cache created by an earlier run for the same instruction is reused
+    (and its TTL extended) rather than creating a new one each run.
+    
+    Args:
+        expired: Cache instance that was rejected by the API; it is recreated
+            unless another caller already replaced it
+        
+    Returns:
+        CachedContent instance, or None if context caching is disabled or
+        the instruction is too short to cache
+    """
+    global _cached_content, _cache_supported
+    
+    if CACHE_TTL_SECONDS <= 0:
+        return None
+    
+    with _cache_lock:
+        if _cache_supported is None:
+            _cache_supported = _instruction_is_cacheable()
+            if not _cache_supported:
+                logger.debug("System instruction is below the context caching minimum, sending it inline")
+        if not _cache_supported:
+            return None
+        
+        if _cached_content is None or _cached_content is expired:
+            ttl = timedelta(seconds=CACHE_TTL_SECONDS)
+            cache = None if expired is not None else _find_cached_content()
+            if cache is not None:
+                try:
+                    cache.update(ttl=ttl)
+                    logger.info("Reusing context cache: %s", cache.name)
+                except google_exceptions.NotFound:
+                    cache = None
+            if cache is None:
+                cache = caching.CachedContent.create(
+                    model=MODEL_NAME,
+                    display_name=CACHE_DISPLAY_NAME,
+                    system_instruction=SYSTEM_INSTRUCTION,
+                    ttl=ttl
+                )
+                logger.info("Created context cache: %s", cache.name)
+            _cached_content = cache
+        return _cached_content
+
+
+@dataclass
+class AnalysisResult:
+    """
+    Outcome of analyzing a single code file.
+    """
+    
+    __slots__ = ('file_path', 'file_name', 'language', 'status', 'analysis')
+    
+    file_path: str
+    file_name: str
+    language: str
+    status: str
+    analysis: str
+
+
+class AnalysisCache:
+    """
+    Persistent store of analysis results keyed on file content and analysis variant.
+    """
+    
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "hash TEXT NOT NULL, model TEXT NOT NULL, result TEXT NOT NULL, "
+            "PRIMARY KEY (hash, model))"
+        )
+        self.connection.commit()
+    
+    @staticmethod
+    def content_hash(content: str, language: str) -> str:
+        """
+        Hash file content together with its language.
+        
+        Uses BLAKE3 when the blake3 package is installed and SHA-256 otherwise,
+        which OpenSSL runs with the CPU's SHA extensions where available.
+        
+        Args:
+            content: Content of the file
+            language: Programming language of the file
+            
+        Returns:
+            Hex digest identifying the content
+        """
+        digest = blake3() if blake3 is not None else hashlib.sha256()
+        digest.update(language.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()[:32]
+    
+    def get(self, content_hash: str, model: str) -> Optional[AnalysisResult]:
+        """
+        Return the stored result for a content hash, if any.
+        
+        Args:
+            content_hash: Hash from content_hash()
+            model: Variant the result was produced with, see CodeAnalyzer.cache_variant
+            
+        Returns:
+            Stored analysis result, or None
+        """
+        row = self.connection.execute(
+            "SELECT result FROM analyses WHERE hash = ? AND model = ?",
+            (content_hash, model)
+        ).fetchone()
+        return AnalysisResult(**json.loads(row[0])) if row else None
+    
+    def put(self, model: str, entries: List[Tuple[str, AnalysisResult]]):
+        """
+        Store analysis results in one transaction, replacing any previous ones.
+        
+        Args:
+            model: Variant the results were produced with, see CodeAnalyzer.cache_variant
+            entries: List of (content hash from content_hash(), result) tuples
+        """
+        if not entries:
+            return
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO analyses (hash, model, result) VALUES (?, ?, ?)",
+            [(content_hash, model, json.dumps(asdict(analysis_result))) for content_hash, analysis_result in entries]
+        )
+        self.connection.commit()
+
+
+class CodeAnalyzer:
+    
+    def __init__(self, compress: bool = True, use_cache: bool = True):
+        self.system_instruction = SYSTEM_INSTRUCTION
+        self.compress = compress
+        self.use_cache = use_cache
+        self.cache_variant = f"{MODEL_NAME}:{PROMPT_DIGEST}:{'compressed' if compress else 'verbatim'}"
+        self.generation_config = genai.GenerationConfig(temperature=0)
+        self.model = self._create_model()
+        
+        try:
+            self.cache = AnalysisCache()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Analysis cache unavailable: %s", e)
+            self.cache = None
+    
+    def _compress(self, content: str, language: str) -> str:
+        """
+        Strip content that rarely matters for review before sending code to the model.
+        
+        Comments (and, for Python, docstrings) are removed, long string literals
+        are shortened and trailing whitespace is dropped. Line breaks are kept
+        so that line numbers in the analysis match the original file.
+        
+        Args:
+            content: Content of the file
+            language: Programming language of the file
+            
+        Returns:
+            Compressed content, or the original content if compression is disabled
+            or would change the number of lines
+        """
+        if not self.compress:
+            return content
+        
+        compressed = content
+        try:
+            if language == 'Python':
+                compressed = _strip_python(compressed)
+            else:
+                if language in _C_STYLE_COMMENT_LANGUAGES:
+                    compressed = _strip_comments(compressed, _C_STYLE_COMMENT_RE)
+                if language in _HASH_COMMENT_LANGUAGES:
+                    compressed = _strip_comments(compressed, _HASH_COMMENT_RE)
+        except (tokenize.TokenError, SyntaxError) as e:
+            logger.debug("Could not tokenize %s code, only trimming whitespace: %s", language, e)
+        
+        compressed = '\n'.join(line.rstrip() for line in compressed.split('\n'))
+        if compressed.count('\n') != content.count('\n'):
+            logger.debug("Compression moved line numbers in %s code, sending it uncompressed", language)
+            return content
+        return compressed
+    
+    def _create_model(self, expired_cache=None):
+        """
+        Build the Gemini model, serving the system instruction from the context cache when possible.
+        
+        The generation config built in __init__ is bound to the model, so
+        individual requests do not carry or re-validate it.
+        
+        Args:
+            expired_cache: Cache instance to replace before building the model
+            
+        Returns:
+            GenerativeModel instance
+        """
+        self.cached_content = None
+        try:
+            self.cached_content = get_cached_content(expired=expired_cache)
+        except Exception as e:
+            logger.warning("Context caching unavailable, sending instruction inline: %s", e)
+        
+        if self.cached_content is not None:
+            return genai.GenerativeModel.from_cached_content(
+                cached_content=self.cached_content,
+                generation_config=self.generation_config
+            )
+        return genai.GenerativeModel(
+            MODEL_NAME,
+            system_instruction=self.system_instruction,
+            generation_config=self.generation_config
+        )
+    
+    async def _generate(self, prompt: str):
+        """
+        Send a prompt to the model, recreating an expired context cache once.
+        
+        Args:
+            prompt: Prompt text
+            
+        Returns:
+            Model response
+        """
+        try:
+            return await self.model.generate_content_async(prompt)
+        except google_exceptions.NotFound:
+            if self.cached_content is None:
+                raise
+            logger.info("Context cache expired, recreating it")
+            loop = asyncio.get_running_loop()
+            self.model = await loop.run_in_executor(None, self._create_model, self.cached_content)
+            return await self.model.generate_content_async(prompt)
     
-    def analyze_file(self, file_path: Path, content: str, language: str) -> Dict[str, Any]:
+    async def analyze_file(self, file_path: Path, content: str, language: str) -> AnalysisResult:
         """
         Analyze a code file for security issues and bad practices.
         
+        Files whose content was already analyzed by the same model, prompt
+        and compression setting are answered from the analysis cache.
+        
         Args:
             file_path: Path to the file being analyzed
             content: Content of the file
             language: Programming language of the file
             
         Returns:
-            Dictionary containing analysis results
+            AnalysisResult for the file
         """
-        logger.info(f"Analyzing file: {file_path.name}")
+        content_hash, cached_result = self._lookup_cache(file_path, content, language)
+        if cached_result is not None:
+            return cached_result
         
-        prompt = f"""{self.system_instruction}
-
-Analyze the following {language} code file for security vulnerabilities, bugs, and bad coding practices.
+        analysis_result = await self._request_file(file_path, content, language)
+        self._store_cache([(content_hash, analysis_result)])
+        return analysis_result
+    
+    async def analyze_batch(self, items: List[Tuple[Path, str, str]]) -> List[AnalysisResult]:
+        """
+        Analyze several code files with a single model request.
+        
+        Files found in the analysis cache are answered from it and left out
+        of the request.
+        
+        Args:
+            items: List of (file_path, content, language) tuples
+            
+        Returns:
+            List of analysis results, in the same order as items
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(items)
+        pending = []
+        for position, item in enumerate(items):
+            content_hash, cached_result = self._lookup_cache(*item)
+            if cached_result is not None:
+                results[position] = cached_result
+            else:
+                pending.append((position, content_hash, item))
+        
+        if len(pending) == 1:
+            fresh_results = [await self._request_file(*pending[0][2])]
+        elif pending:
+            fresh_results = await self._request_batch([item for _, _, item in pending])
+        else:
+            fresh_results = []
+        
+        for (position, _, _), analysis_result in zip(pending, fresh_results):
+            results[position] = analysis_result
+        self._store_cache([
+            (content_hash, analysis_result)
+            for (_, content_hash, _), analysis_result in zip(pending, fresh_results)
+        ])
+        
+        return results
+    
+    def _lookup_cache(self, file_path: Path, content: str, language: str) -> Tuple[Optional[str], Optional[AnalysisResult]]:
+        """
+        Look up a previous analysis of the same content.
+        
+        Args:
+            file_path: Path to the file being analyzed
+            content: Content of the file
+            language: Programming language of the file
+            
+        Returns:
+            Tuple of (content hash or None if caching is off, cached result or None)
+        """
+        if self.cache is None:
+            return None, None
+        
+        content_hash = AnalysisCache.content_hash(content, language)
+        if not self.use_cache:
+            return content_hash, None
+        
+        cached_result = self.cache.get(content_hash, self.cache_variant)
+        if cached_result is not None:
+            cached_result.file_path = str(file_path)
+            cached_result.file_name = file_path.name
+            cached_result.language = language
+            logger.info("Using cached analysis for: %s", file_path.name)
+        return content_hash, cached_result
+    
+    def _store_cache(self, entries: List[Tuple[Optional[str], AnalysisResult]]):
+        """
+        Store the successful analyses in the cache.
+        
+        Args:
+            entries: List of (hash returned by _lookup_cache, result) tuples
+        """
+        if self.cache is not None:
+            self.cache.put(self.cache_variant, [
+                (content_hash, analysis_result) for content_hash, analysis_result in entries
+                if content_hash is not None and analysis_result.status == 'success'
+            ])
+    
+    async def _request_file(self, file_path: Path, content: str, language: str) -> AnalysisResult:
+        """
+        Send a single code file to the model.
+        
+        Args:
+            file_path: Path to the file being analyzed
+            content: Content of the file
+            language: Programming language of the file
+            
+        Returns:
+            AnalysisResult for the file
+        """
+        logger.info("Analyzing file: %s", file_path.name)
+        
+        prompt = f"""Analyze the following {language} code file for security vulnerabilities, bugs, and bad coding practices.
 
 File: {file_path.name}
 Language: {language}
 
 Code:
 ```{language.lower()}
-{content}
+{self._compress(content, language)}
 ```
 
 Provide a comprehensive security and code quality analysis.
 """
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt)
             
-            analysis_result = {
-                'file_path': str(file_path),
-                'language': language,
-                'status': 'success',
-                'analysis': response.text,
-                'file_name': file_path.name
-            }
+            analysis_result = AnalysisResult(
+                file_path=str(file_path),
+                file_name=file_path.name,
+                language=language,
+                status='success',
+                analysis=response.text
+            )
             
-            logger.info(f"Analysis completed for: {file_path.name}")
+            logger.info("Analysis completed for: %s", file_path.name)
             return analysis_result
             
         except Exception as e:
-            logger.error(f"Error analyzing {file_path.name}: {str(e)}")
-            return {
-                'file_path': str(file_path),
-                'language': language,
-                'status': 'error',
-                'analysis': f"Error during analysis: {str(e)}",
-                'file_name': file_path.name
-            }
+            logger.error("Error analyzing %s: %s", file_path.name, e)
+            return AnalysisResult(
+                file_path=str(file_path),
+                file_name=file_path.name,
+                language=language,
+                status='error',
+                analysis=f"Error during analysis: {str(e)}"
+            )
+    
+    async def _request_batch(self, items: List[Tuple[Path, str, str]]) -> List[AnalysisResult]:
+        """
+        Send several code files to the model in one request.
+        
+        Args:
+            items: List of (file_path, content, language) tuples
+            
+        Returns:
+            List of analysis results, in the same order as items
+        """
+        names = ', '.join(file_path.name for file_path, _, _ in items)
+        logger.info("Analyzing batch of %d files: %s", len(items), names)
+        
+        sections = []
+        for index, (file_path, content, language) in enumerate(items, 1):
+            sections.append(f"""### FILE {index}: {file_path.name}
+Language: {language}
+
+```{language.lower()}
+{self._compress(content, language)}
+```
+""")
+        files_text = "\n".join(sections)
+        
+        prompt = f"""Analyze each of the following {len(items)} code files for security vulnerabilities, bugs, and bad coding practices.
+Provide a comprehensive security and code quality analysis for each one, starting each with its
+delimiter line ({BATCH_DELIMITER.format(index=1)}, {BATCH_DELIMITER.format(index=2)}, ...).
+
+{files_text}"""
+        
+        try:
+            response = await self._generate(prompt)
+        except google_exceptions.BadRequest as e:
+            # The request itself was rejected, likely because of one file; the others deserve a try.
+            logger.warning("Batch request rejected (%s), retrying files individually", e)
+            return await self._request_each(items)
+        except Exception as e:
+            logger.error("Error analyzing batch (%s): %s", names, e)
+            return [
+                AnalysisResult(
+                    file_path=str(file_path),
+                    file_name=file_path.name,
+                    language=language,
+                    status='error',
+                    analysis=f"Error during analysis: {str(e)}"
+                )
+                for file_path, _, language in items
+            ]
+        
+        try:
+            analyses = self._split_batch_response(response.text, len(items))
+        except ValueError as e:
+            logger.warning("Could not parse batch response (%s), retrying files individually", e)
+            return await self._request_each(items)
+        
+        results = []
+        for (file_path, _, language), analysis in zip(items, analyses):
+            results.append(AnalysisResult(
+                file_path=str(file_path),
+                file_name=file_path.name,
+                language=language,
+                status='success',
+                analysis=analysis
+            ))
+            logger.info("Analysis completed for: %s", file_path.name)
+        
+        return results
+    
+    async def _request_each(self, items: List[Tuple[Path, str, str]]) -> List[AnalysisResult]:
+        """
+        Send the files of a failed batch to the model one request at a time.
+        
+        Requests are sequential because the caller holds a single concurrency
+        slot for the whole batch.
+        
+        Args:
+            items: List of (file_path, content, language) tuples
+            
+        Returns:
+            List of analysis results, in the same order as items
+        """
+        return [await self._request_file(*item) for item in items]
+    
+    @staticmethod
+    def _split_batch_response(text: str, expected: int) -> List[str]:
+        """
+        Split a batched model response into per-file analyses.
+        
+        Args:
+            text: Raw response text
+            expected: Number of files in the batch
+            
+        Returns:
+            List of analysis texts ordered by file number
+            
+        Raises:
+            ValueError: If the response does not contain exactly one section per file
+        """
+        parts = _BATCH_SECTION_RE.split(text)
+        sections = {}
+        for number, body in zip(parts[1::2], parts[2::2]):
+            index = int(number)
+            if index in sections or not 1 <= index <= expected:
+                raise ValueError(f"unexpected section for file {index}")
+            sections[index] = body.strip()
+        
+        if len(sections) != expected or not all(sections.values()):
+            raise ValueError(f"expected {expected} sections, got {len(sections)}")
+        
+        return [sections[index] for index in range(1, expected + 1)]
     
     def create_summary(self, all_results: list) -> str:
         """
@@ -126,7 +842,7 @@ Provide a comprehensive security and code quality analysis.
             Summary text
         """
         total_files = len(all_results)
-        successful = sum(1 for r in all_results if r['status'] == 'success')
+        successful = sum(1 for r in all_results if r.status == 'success')
         failed = total_files - successful
         
         summary = f"""# Sentinel Code Analysis Summary
@@ -140,8 +856,8 @@ Provide a comprehensive security and code quality analysis.
 """
         
         for result in all_results:
-            status_emoji = "✅" if result['status'] == 'success' else "❌"
-            summary += f"- {status_emoji} {result['file_name']} ({result['language']})\n"
+            status_emoji = "✅" if result.status == 'success' else "❌"
+            summary += f"- {status_emoji} {result.file_name} ({result.language})\n"
         
         summary += """
 ## Next Steps
@@ -1,19 +1,32 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+import itertools
 import logging
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from scanner import CodeScanner
-from analyzer import CodeAnalyzer
+from analyzer import AnalysisResult, CodeAnalyzer
 from reporter import ReportGenerator
 from github_pusher import GitHubPusher
 
+MAX_BATCH = 8
+BATCH_WINDOW_SECONDS = 0.25
+MAX_CONCURRENCY = 16
+SCAN_QUEUE_SIZE = 128
+REPORT_QUEUE_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
 
 def setup_logging(verbose: bool = False):
     """
@@ -27,10 +40,181 @@ def setup_logging(verbose: bool = False):
     logging.basicConfig(
         level=level,
         format='%(asctime)s [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        datefmt='%Y-%m-%d %H:%M:%S',
+        force=True
     )
 
 
+def _error_result(file_path: Path, language: str, error: Exception) -> AnalysisResult:
+    """
+    Build the result record for a file that could not be processed.
+    
+    Args:
+        file_path: Path to the file
+        language: Programming language of the file
+        error: Exception raised while processing the file
+        
+    Returns:
+        AnalysisResult with an error status
+    """
+    return AnalysisResult(
+        file_path=str(file_path),
+        file_name=file_path.name,
+        language=language,
+        status='error',
+        analysis=f"Processing error: {str(error)}"
+    )
+
+
+async def analyze_files(
+    scanner: CodeScanner,
+    analyzer: CodeAnalyzer,
+    reporter: ReportGenerator,
+    code_files: Iterable[Path],
+    batch_size: int = MAX_BATCH,
+    concurrency: int = MAX_CONCURRENCY
+) -> List[AnalysisResult]:
+    """
+    Analyze code files in batches with a bounded number of concurrent requests.
+    
+    The three stages overlap: code_files is consumed on a scanner thread
+    that feeds a bounded queue, so analysis starts with the first file
+    found. Files are read off the event loop and grouped into batches of up
+    to batch_size files (or whatever arrived within BATCH_WINDOW_SECONDS).
+    Reports are written on a dedicated writer thread fed through a bounded
+    queue, so disk writes never stall the event loop.
+    
+    A concurrency slot is taken before each batch is dispatched and held
+    until its reports are queued, so when analysis falls behind the scan
+    queue fills up and blocks the scanner instead of every file being read
+    into memory.
+    
+    Args:
+        scanner: Scanner used to read files and detect languages
+        analyzer: Analyzer used to review the files
+        reporter: Report generator for per-file reports
+        code_files: Files to analyze, typically scanner.stream()
+        batch_size: Maximum number of files per model request
+        concurrency: Maximum number of model requests in flight
+        
+    Returns:
+        List of analysis results in the order of code_files
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    scan_queue: asyncio.Queue = asyncio.Queue(maxsize=SCAN_QUEUE_SIZE)
+    report_queue: queue.Queue = queue.Queue(maxsize=REPORT_QUEUE_SIZE)
+    indexed_results: List[Tuple[int, AnalysisResult]] = []
+    
+    def scan_files():
+        found = 0
+        try:
+            for file_path in code_files:
+                asyncio.run_coroutine_threadsafe(scan_queue.put(file_path), loop).result()
+                found += 1
+            logger.info("Found %d code files", found)
+        except Exception as e:
+            logger.error("✗ Scan failed: %s", e)
+        finally:
+            asyncio.run_coroutine_threadsafe(scan_queue.put(None), loop).result()
+    
+    def write_reports():
+        while True:
+            item = report_queue.get()
+            try:
+                if item is None:
+                    break
+                index, file_path, analysis_result = item
+                file_name = analysis_result.file_name
+                try:
+                    reporter.generate_file_report(analysis_result)
+                    logger.info("✓ Completed: %s", file_name)
+                except Exception as e:
+                    logger.error("✗ Failed to process %s: %s", file_name, e)
+                    analysis_result = _error_result(file_path, analysis_result.language, e)
+                indexed_results.append((index, analysis_result))
+            finally:
+                report_queue.task_done()
+    
+    async def enqueue_report(item):
+        try:
+            report_queue.put_nowait(item)
+        except queue.Full:
+            await loop.run_in_executor(None, report_queue.put, item)
+    
+    async def analyze(batch: List[Tuple[int, Path, str, str]]):
+        items = [(file_path, content, language) for _, file_path, content, language in batch]
+        try:
+            try:
+                results = await analyzer.analyze_batch(items)
+            except Exception as e:
+                results = [_error_result(file_path, language, e) for file_path, _, language in items]
+            for (index, file_path, _, _), analysis_result in zip(batch, results):
+                await enqueue_report((index, file_path, analysis_result))
+        finally:
+            semaphore.release()
+    
+    async def dispatch(batch: List[Tuple[int, Path, str, str]]):
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(analyze(batch)))
+    
+    writer = threading.Thread(target=write_reports, name='sentinel-report-writer', daemon=True)
+    writer.start()
+    threading.Thread(target=scan_files, name='sentinel-scanner', daemon=True).start()
+    tasks = []
+    batch = []
+    batch_started = 0.0
+    idx = 0
+    
+    while True:
+        timeout = None
+        if batch:
+            timeout = max(0.0, batch_started + BATCH_WINDOW_SECONDS - time.monotonic())
+        try:
+            file_path = await asyncio.wait_for(scan_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            await dispatch(batch)
+            batch = []
+            continue
+        
+        if file_path is None:
+            break
+        
+        idx += 1
+        file_name = file_path.name
+        language = scanner.get_language(file_path)
+        logger.info("[%d] Processing: %s", idx, file_name)
+        
+        try:
+            content = await loop.run_in_executor(None, scanner.get_file_content, file_path)
+        except Exception as e:
+            logger.error("✗ Failed to process %s: %s", file_name, e)
+            indexed_results.append((idx, _error_result(file_path, language, e)))
+            continue
+        
+        if not batch:
+            batch_started = time.monotonic()
+        batch.append((idx, file_path, content, language))
+        
+        if len(batch) >= batch_size or time.monotonic() - batch_started >= BATCH_WINDOW_SECONDS:
+            await dispatch(batch)
+            batch = []
+    
+    if batch:
+        await dispatch(batch)
+    
+    for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(outcome, Exception):
+            logger.error("✗ Analysis task failed: %s", outcome)
+    
+    await enqueue_report(None)
+    await loop.run_in_executor(None, report_queue.join)
+    writer.join()
+    
+    indexed_results.sort(key=lambda item: item[0])
+    return [analysis_result for _, analysis_result in indexed_results]
+
+
 def main():
     """
     Main entry point for Sentinel Code Agent CLI.
@@ -79,58 +263,69 @@ Examples:
         help='Maximum number of files to analyze (useful for testing)'
     )
     
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=MAX_BATCH,
+        help=f'Maximum number of files sent to the model in one request (default: {MAX_BATCH})'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=MAX_CONCURRENCY,
+        help=f'Maximum number of concurrent model requests (default: {MAX_CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--no-compress',
+        action='store_true',
+        help='Send files to the model verbatim instead of stripping comments and docstrings'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-analyze every file instead of reusing cached results (the cache is still refreshed)'
+    )
+    
     args = parser.parse_args()
     
     setup_logging(args.verbose)
-    logger = logging.getLogger(__name__)
     
     try:
         logger.info("=" * 70)
         logger.info("🛡️  SENTINEL CODE AGENT - Security Analysis Starting")
         logger.info("=" * 70)
         
-        scanner = CodeScanner(args.project_path)
-        code_files = scanner.scan()
+        project_root = Path(args.project_path).resolve()
+        scanner = CodeScanner(project_root)
+        code_files = scanner.stream()
         
-        if not code_files:
+        if args.max_files:
+            code_files = itertools.islice(code_files, args.max_files)
+            logger.info("Limiting analysis to %d files", args.max_files)
+        
+        first_file = next(code_files, None)
+        if first_file is None:
             logger.warning("No code files found to analyze")
             sys.exit(0)
+        code_files = itertools.chain([first_file], code_files)
         
-        if args.max_files:
-            code_files = code_files[:args.max_files]
-            logger.info(f"Limiting analysis to {args.max_files} files")
-        
-        logger.info(f"Analyzing {len(code_files)} files...")
+        logger.info("Analyzing files as they are found...")
         logger.info("-" * 70)
         
-        analyzer = CodeAnalyzer()
-        reporter = ReportGenerator(Path(args.project_path))
+        analyzer = CodeAnalyzer(compress=not args.no_compress, use_cache=not args.no_cache)
+        reporter = ReportGenerator(project_root)
         
-        all_results = []
-        
-        for idx, file_path in enumerate(code_files, 1):
-            logger.info(f"[{idx}/{len(code_files)}] Processing: {file_path.name}")
-            
-            try:
-                content = scanner.get_file_content(file_path)
-                language = scanner.get_language(file_path)
-                
-                analysis_result = analyzer.analyze_file(file_path, content, language)
-                all_results.append(analysis_result)
-                
-                reporter.generate_file_report(analysis_result)
-                
-                logger.info(f"✓ Completed: {file_path.name}")
-                
-            except Exception as e:
-                logger.error(f"✗ Failed to process {file_path.name}: {str(e)}")
-                all_results.append({
-                    'file_path': str(file_path),
-                    'file_name': file_path.name,
-                    'language': scanner.get_language(file_path),
-                    'status': 'error',
-                    'analysis': f"Processing error: {str(e)}"
-                })
+        all_results = asyncio.run(analyze_files(
+            scanner,
+            analyzer,
+            reporter,
+            code_files,
+            batch_size=max(1, args.batch_size),
+            concurrency=max(1, args.concurrency)
+        ))
         
         logger.info("-" * 70)
         logger.info("Generating summary report...")
@@ -139,7 +334,7 @@ Examples:
         reporter.generate_summary_report(summary)
         
         logger.info("✓ All reports generated successfully")
-        logger.info(f"Reports location: {reporter.issues_dir}")
+        logger.info("Reports location: %s", reporter.issues_dir)
         
         if args.push:
             logger.info("-" * 70)
@@ -147,7 +342,7 @@ Examples:
             
             try:
                 pusher = GitHubPusher(
-                    Path(args.project_path),
+                    project_root,
                     github_token=args.github_token
                 )
                 
@@ -158,11 +353,11 @@ Examples:
                     sys.exit(1)
                     
             except ValueError as e:
-                logger.error(f"✗ GitHub push error: {str(e)}")
+                logger.error("✗ GitHub push error: %s", e)
                 logger.info("Reports are still available locally in the issues/ directory")
                 sys.exit(1)
             except Exception as e:
-                logger.error(f"✗ Unexpected error during GitHub push: {str(e)}")
+                logger.error("✗ Unexpected error during GitHub push: %s", e)
                 logger.info("Reports are still available locally in the issues/ directory")
                 sys.exit(1)
         
@@ -170,28 +365,28 @@ Examples:
         logger.info("🛡️  SENTINEL CODE AGENT - Analysis Complete")
         logger.info("=" * 70)
         
-        logger.info(f"\n📊 Summary:")
-        logger.info(f"   Files Analyzed: {len(all_results)}")
-        logger.info(f"   Successful: {sum(1 for r in all_results if r['status'] == 'success')}")
-        logger.info(f"   Failed: {sum(1 for r in all_results if r['status'] == 'error')}")
-        logger.info(f"\n📂 Reports saved to: {reporter.issues_dir}")
+        logger.info("\n📊 Summary:")
+        logger.info("   Files Analyzed: %d", len(all_results))
+        logger.info("   Successful: %d", sum(1 for r in all_results if r.status == 'success'))
+        logger.info("   Failed: %d", sum(1 for r in all_results if r.status == 'error'))
+        logger.info("\n📂 Reports saved to: %s", reporter.issues_dir)
         
         if args.push:
-            logger.info(f"🔗 GitHub branch: sentinel-reports")
+            logger.info("🔗 GitHub branch: sentinel-reports")
         
         logger.info("\n✓ All operations completed successfully\n")
         
     except FileNotFoundError as e:
-        logger.error(f"✗ Error: {str(e)}")
+        logger.error("✗ Error: %s", e)
         sys.exit(1)
     except NotADirectoryError as e:
-        logger.error(f"✗ Error: {str(e)}")
+        logger.error("✗ Error: %s", e)
         sys.exit(1)
     except KeyboardInterrupt:
         logger.warning("\n\n⚠️  Analysis interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"✗ Unexpected error: {str(e)}")
+        logger.error("✗ Unexpected error: %s", e)
         if args.verbose:
             import traceback
             traceback.print_exc()
@@ -1,15 +1,43 @@
 from pathlib import Path
 from datetime import datetime
+import base64
 import logging
+import shlex
 import subprocess
 import os
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+else:
+    class _PushCallbacks(pygit2.RemoteCallbacks):
+        
+        def __init__(self, credentials=None):
+            super().__init__(credentials=credentials)
+            self.rejected = {}
+        
+        def push_update_reference(self, refname, message):
+            """
+            Record refs the remote rejected; libgit2 reports these here instead of raising.
+            
+            Args:
+                refname: Name of the pushed ref
+                message: Rejection reason, or None if the ref was accepted
+            """
+            if message is not None:
+                self.rejected[refname] = message
+
 logger = logging.getLogger(__name__)
 
 
 class GitHubPusher:
     
+    __slots__ = ('project_path', 'github_token', 'issues_dir')
+    
     BRANCH_NAME = "sentinel-reports"
+    NO_CHANGES_MARKER = "sentinel-no-changes"
+    AUTHENTICATED_COMMANDS = frozenset({'push', 'fetch'})
     
     def __init__(self, project_path: Path, github_token: str = None):
         self.project_path = project_path
@@ -33,39 +61,64 @@ class GitHubPusher:
         """
         Run a Git command and return the result.
         
+        Network commands (push/fetch) authenticate with the GitHub token, if
+        any, through a per-invocation HTTP header rather than the remote URL.
+        The header is passed as GIT_CONFIG_* environment variables (Git 2.31+),
+        so the token never appears in the process list.
+        
         Args:
             command: List of command arguments
             
         Returns:
             Tuple of (success: bool, output: str)
         """
+        env = None
+        if self.github_token and len(command) > 1 and command[1] in self.AUTHENTICATED_COMMANDS:
+            credentials = base64.b64encode(f"x-access-token:{self.github_token}".encode()).decode()
+            env = os.environ.copy()
+            count = int(env.get('GIT_CONFIG_COUNT') or 0)
+            env['GIT_CONFIG_COUNT'] = str(count + 1)
+            env[f'GIT_CONFIG_KEY_{count}'] = 'http.extraHeader'
+            env[f'GIT_CONFIG_VALUE_{count}'] = f'Authorization: Basic {credentials}'
+        
         try:
             result = subprocess.run(
                 command,
                 cwd=self.project_path,
+                env=env,
                 capture_output=True,
                 text=True,
                 check=True
             )
             return True, result.stdout.strip()
         except subprocess.CalledProcessError as e:
-            logger.error(f"Git command failed: {' '.join(command)}")
-            logger.error(f"Error: {e.stderr}")
+            logger.error("Git command failed: %s", ' '.join(command))
+            logger.error("Error: %s", e.stderr)
             return False, e.stderr
     
-    def _configure_git_auth(self):
-        """
-        Configure Git authentication using the GitHub token.
+    def _run_shell(self, script: str) -> tuple:
         """
-        if self.github_token:
-            logger.info("Configuring Git authentication with GitHub token")
+        Run a shell script in the project directory, so several Git commands share one process spawn.
+        
+        Args:
+            script: Script passed to sh -c
             
-            success, remote_url = self._run_git_command(['git', 'remote', 'get-url', 'origin'])
-            if success and remote_url:
-                if remote_url.startswith('https://github.com/'):
-                    repo_path = remote_url.replace('https://github.com/', '')
-                    authenticated_url = f"https://{self.github_token}@github.com/{repo_path}"
-                    self._run_git_command(['git', 'remote', 'set-url', 'origin', authenticated_url])
+        Returns:
+            Tuple of (success: bool, output: str)
+        """
+        try:
+            result = subprocess.run(
+                ['sh', '-c', script],
+                cwd=self.project_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            return True, result.stdout.strip()
+        except subprocess.CalledProcessError as e:
+            logger.error("Shell command failed: %s", script)
+            logger.error("Error: %s", e.stderr)
+            return False, e.stderr
     
     def _get_current_branch(self) -> str:
         """
@@ -90,58 +143,151 @@ class GitHubPusher:
         success, _ = self._run_git_command(['git', 'rev-parse', '--verify', branch_name])
         return success
     
+    def _commit_reports_pygit2(self, repo, commit_message: str) -> bool:
+        """
+        Commit the report files onto the reports branch without touching the working tree.
+        
+        The commit is built from an in-memory index seeded with the branch's
+        current tree (or HEAD's, for a new branch), so no checkout is needed.
+        
+        Args:
+            repo: pygit2 Repository for the project
+            commit_message: Commit message
+            
+        Returns:
+            True if a commit was created, False if there was nothing to commit
+        """
+        branch = repo.branches.local.get(self.BRANCH_NAME)
+        parent = branch.peel(pygit2.Commit) if branch is not None else repo.head.peel(pygit2.Commit)
+        
+        index = pygit2.Index()
+        index.read_tree(parent.tree)
+        for report_path in sorted(self.issues_dir.rglob('*')):
+            if report_path.is_file():
+                blob_id = repo.create_blob_fromdisk(str(report_path))
+                relative_path = report_path.relative_to(self.project_path).as_posix()
+                index.add(pygit2.IndexEntry(relative_path, blob_id, pygit2.GIT_FILEMODE_BLOB))
+        
+        tree_id = index.write_tree(repo)
+        if tree_id == parent.tree.id:
+            return False
+        
+        signature = repo.default_signature
+        repo.create_commit(
+            f"refs/heads/{self.BRANCH_NAME}",
+            signature,
+            signature,
+            commit_message,
+            tree_id,
+            [parent.id]
+        )
+        return True
+    
+    def _push_reports_pygit2(self) -> bool:
+        """
+        Commit and push reports in-process with pygit2.
+        
+        The push goes through libgit2 only for https remotes with a GitHub
+        token; otherwise it is delegated to the git CLI so that SSH keys and
+        configured credential helpers still apply.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            repo = pygit2.Repository(str(self.project_path))
+            
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            commit_message = f"Sentinel Analysis Report - {timestamp}"
+            
+            logger.info("Committing reports to branch: %s", self.BRANCH_NAME)
+            if not self._commit_reports_pygit2(repo, commit_message):
+                logger.info("No changes to commit")
+                return True
+            
+            logger.info("Pushing to remote: %s", self.BRANCH_NAME)
+            remote = repo.remotes['origin']
+            if not self.github_token or not remote.url.startswith('https://'):
+                success, _ = self._run_git_command(['git', 'push', '-u', 'origin', self.BRANCH_NAME])
+                if not success:
+                    logger.error("Failed to push to GitHub")
+                return success
+            
+            callbacks = _PushCallbacks(
+                credentials=pygit2.UserPass('x-access-token', self.github_token)
+            )
+            refspec = f"refs/heads/{self.BRANCH_NAME}:refs/heads/{self.BRANCH_NAME}"
+            remote.push([refspec], callbacks=callbacks)
+            
+            if callbacks.rejected:
+                for refname, message in callbacks.rejected.items():
+                    logger.error("Remote rejected %s: %s", refname, message)
+                return False
+            
+            logger.info("✓ Successfully pushed reports to GitHub")
+            return True
+            
+        except pygit2.GitError as e:
+            if 'auth' in str(e).lower():
+                logger.error("GitHub authentication failed. Please set GITHUB_TOKEN environment variable")
+            else:
+                logger.error("Git operation failed: %s", e)
+            return False
+        except Exception as e:
+            logger.error("Error during GitHub push: %s", e)
+            return False
+    
     def push_reports(self) -> bool:
         """
         Stage, commit, and push reports to GitHub.
         
+        Uses pygit2 when it is installed and falls back to the git CLI otherwise.
+        
         Returns:
             True if successful, False otherwise
         """
+        if pygit2 is not None:
+            return self._push_reports_pygit2()
+        
         try:
             logger.info("Starting GitHub push process...")
             
-            if self.github_token:
-                self._configure_git_auth()
-            
             original_branch = self._get_current_branch()
-            logger.info(f"Current branch: {original_branch}")
+            logger.info("Current branch: %s", original_branch)
             
             if self._branch_exists(self.BRANCH_NAME):
-                logger.info(f"Switching to existing branch: {self.BRANCH_NAME}")
+                logger.info("Switching to existing branch: %s", self.BRANCH_NAME)
                 success, _ = self._run_git_command(['git', 'checkout', self.BRANCH_NAME])
                 if not success:
-                    logger.error(f"Failed to checkout branch: {self.BRANCH_NAME}")
+                    logger.error("Failed to checkout branch: %s", self.BRANCH_NAME)
                     return False
             else:
-                logger.info(f"Creating new branch: {self.BRANCH_NAME}")
+                logger.info("Creating new branch: %s", self.BRANCH_NAME)
                 success, _ = self._run_git_command(['git', 'checkout', '-b', self.BRANCH_NAME])
                 if not success:
-                    logger.error(f"Failed to create branch: {self.BRANCH_NAME}")
+                    logger.error("Failed to create branch: %s", self.BRANCH_NAME)
                     return False
             
-            logger.info("Staging report files...")
-            success, _ = self._run_git_command(['git', 'add', 'issues/'])
-            if not success:
-                logger.error("Failed to stage files")
-                return False
-            
-            status_success, status = self._run_git_command(['git', 'status', '--porcelain'])
-            if status_success and not status:
-                logger.info("No changes to commit")
-                self._run_git_command(['git', 'checkout', original_branch])
-                return True
-            
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             commit_message = f"Sentinel Analysis Report - {timestamp}"
             
-            logger.info(f"Committing changes: {commit_message}")
-            success, _ = self._run_git_command(['git', 'commit', '-m', commit_message])
+            logger.info("Staging and committing report files: %s", commit_message)
+            success, output = self._run_shell(
+                "git add issues/ && "
+                f"if git diff --cached --quiet -- issues/; then echo {self.NO_CHANGES_MARKER}; "
+                f"else git commit -q -m {shlex.quote(commit_message)} -- issues/; fi"
+            )
             if not success:
                 logger.error("Failed to commit changes")
                 self._run_git_command(['git', 'checkout', original_branch])
                 return False
             
-            logger.info(f"Pushing to remote: {self.BRANCH_NAME}")
+            if output == self.NO_CHANGES_MARKER:
+                logger.info("No changes to commit")
+                self._run_git_command(['git', 'checkout', original_branch])
+                return True
+            
+            logger.info("Pushing to remote: %s", self.BRANCH_NAME)
             success, output = self._run_git_command(['git', 'push', '-u', 'origin', self.BRANCH_NAME])
             
             if not success:
@@ -156,12 +302,12 @@ class GitHubPusher:
             logger.info("✓ Successfully pushed reports to GitHub")
             
             self._run_git_command(['git', 'checkout', original_branch])
-            logger.info(f"Switched back to branch: {original_branch}")
+            logger.info("Switched back to branch: %s", original_branch)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error during GitHub push: {str(e)}")
+            logger.error("Error during GitHub push: %s", e)
             try:
                 self._run_git_command(['git', 'checkout', original_branch])
             except Exception:
@@ -4,11 +4,26 @@ from google.adk.cli.fast_api import get_fast_api_app
 from agent import root_agent  # Import your agent
 
 # Create FastAPI app using google-adk helper
+# Sessions live in memory unless SESSION_SERVICE_URI points at a shared
+# store (e.g. "sqlite:///sessions.db" or a database URL); running more than
+# one worker requires a shared store, otherwise requests for the same
+# session can land on a worker that has never seen it.
 app = get_fast_api_app(
     agent=root_agent,
+    session_service_uri=os.environ.get("SESSION_SERVICE_URI"),
     # NOTE: do not pass 'agent_dir' if your google-adk version does not support it
 )
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8001)
+    # Pass the app as an import string so each worker process can import it.
+    # "auto" selects uvloop and httptools whenever they are installed.
+    # Set WORKERS above 1 only together with SESSION_SERVICE_URI (see above).
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8001,
+        workers=int(os.environ.get("WORKERS", "1")),
+        loop="auto",
+        http="auto",
+    )
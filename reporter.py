@@ -1,8 +1,11 @@
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import List, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    from analyzer import AnalysisResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,19 +15,19 @@ class ReportGenerator:
         self.project_path = project_path
         self.issues_dir = project_path / 'issues'
         self.issues_dir.mkdir(exist_ok=True)
-        logger.info(f"Reports will be saved to: {self.issues_dir}")
+        logger.info("Reports will be saved to: %s", self.issues_dir)
     
-    def generate_file_report(self, analysis_result: Dict[str, Any]) -> Path:
+    def generate_file_report(self, analysis_result: 'AnalysisResult') -> Path:
         """
         Generate a markdown report for a single file analysis.
         
         Args:
-            analysis_result: Dictionary containing analysis results
+            analysis_result: Analysis result for the file
             
         Returns:
             Path to the generated report file
         """
-        file_name = Path(analysis_result['file_name']).stem
+        file_name = Path(analysis_result.file_name).stem
         report_filename = f"{file_name}_report.md"
         report_path = self.issues_dir / report_filename
         
@@ -32,16 +35,16 @@ class ReportGenerator:
         
         report_content = f"""# 🛡️ Sentinel Code Analysis Report
 
-**File**: `{analysis_result['file_name']}`  
-**Language**: {analysis_result['language']}  
+**File**: `{analysis_result.file_name}`  
+**Language**: {analysis_result.language}  
 **Analysis Date**: {timestamp}  
-**Status**: {analysis_result['status'].upper()}
+**Status**: {analysis_result.status.upper()}
 
 ---
 
 ## 📊 Analysis Results
 
-{analysis_result['analysis']}
+{analysis_result.analysis}
 
 ---
 
@@ -60,10 +63,10 @@ class ReportGenerator:
         try:
             with open(report_path, 'w', encoding='utf-8') as f:
                 f.write(report_content)
-            logger.info(f"Report generated: {report_filename}")
+            logger.info("Report generated: %s", report_filename)
             return report_path
         except Exception as e:
-            logger.error(f"Error writing report for {analysis_result['file_name']}: {str(e)}")
+            logger.error("Error writing report for %s: %s", analysis_result.file_name, e)
             raise
     
     def generate_summary_report(self, summary_text: str) -> Path:
@@ -102,10 +105,10 @@ All individual file reports are located in the `issues/` directory.
         try:
             with open(summary_path, 'w', encoding='utf-8') as f:
                 f.write(report_content)
-            logger.info(f"Summary report generated: SUMMARY.md")
+            logger.info("Summary report generated: SUMMARY.md")
             return summary_path
         except Exception as e:
-            logger.error(f"Error writing summary report: {str(e)}")
+            logger.error("Error writing summary report: %s", e)
             raise
     
     def get_all_reports(self) -> List[Path]:
@@ -1,26 +1,69 @@
+import mmap
 import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, Iterator, List, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+_EXT_TO_LANG: Dict[str, str] = {
+    '.py': 'Python',
+    '.java': 'Java',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'JavaScript React',
+    '.tsx': 'TypeScript React',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.cs': 'C#',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.rs': 'Rust',
+    '.scala': 'Scala'
+}
+
+
+@lru_cache(maxsize=None)
+def get_language_from_suffix(suffix: str) -> str:
+    """
+    Map a file extension to its programming language.
+    
+    Args:
+        suffix: File extension including the leading dot, in any case
+        
+    Returns:
+        Language name as string, or 'Unknown' for unsupported extensions
+    """
+    return _EXT_TO_LANG.get(suffix.lower(), 'Unknown')
+
 
 class CodeScanner:
     
-    SUPPORTED_EXTENSIONS = {
-        '.py', '.java', '.js', '.ts', '.jsx', '.tsx',
-        '.go', '.rb', '.php', '.cpp', '.c', '.cs',
-        '.swift', '.kt', '.rs', '.scala'
-    }
+    __slots__ = ('project_path',)
     
-    EXCLUDED_DIRS = {
+    SUPPORTED_EXTENSIONS: FrozenSet[str] = frozenset(_EXT_TO_LANG)
+    
+    EXCLUDED_DIRS: FrozenSet[str] = frozenset({
         'node_modules', '__pycache__', '.git', '.venv',
         'venv', 'env', 'build', 'dist', '.adk',
-        'target', 'bin', 'obj', '.next', '.cache'
-    }
+        'target', 'bin', 'obj', '.next', '.cache',
+        'vendor', 'third_party', 'generated'
+    })
+    
+    EXCLUDED_SUFFIX_FRAGMENTS: Tuple[str, ...] = ('.min.js', '.bundle.js')
     
-    def __init__(self, project_path: str):
+    PARALLEL_SCAN_THRESHOLD = 500
+    MAX_SOURCE_BYTES = 256 * 1024
+    MMAP_MIN_BYTES = 16 * 1024
+    MAX_FILE_BYTES = 32 * 1024 * 1024
+    
+    def __init__(self, project_path: Union[str, Path]):
         self.project_path = Path(project_path).resolve()
         if not self.project_path.exists():
             raise FileNotFoundError(f"Project directory not found: {project_path}")
@@ -31,41 +74,202 @@ class CodeScanner:
         """
         Scan the project directory for code files.
         
+        Trees with at least PARALLEL_SCAN_THRESHOLD entries at the root are
+        scanned with scan_parallel(); smaller trees are walked on this thread.
+        
         Returns:
             List of Path objects for code files found
         """
-        logger.info(f"Scanning directory: {self.project_path}")
-        code_files = []
+        logger.info("Scanning directory: %s", self.project_path)
         
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in self.EXCLUDED_DIRS]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                    code_files.append(file_path)
-                    logger.debug(f"Found code file: {file_path.relative_to(self.project_path)}")
+        if self._is_large_tree():
+            code_files = self.scan_parallel()
+        else:
+            code_files = list(self.iter_files())
         
-        logger.info(f"Found {len(code_files)} code files")
+        logger.info("Found %d code files", len(code_files))
         return code_files
     
+    def stream(self) -> Iterator[Path]:
+        """
+        Yield code files as soon as they are found.
+        
+        Picks the walk strategy the same way as scan(), but files are yielded
+        in discovery order instead of being collected first.
+        
+        Returns:
+            Iterator over Path objects for code files
+        """
+        logger.info("Scanning directory: %s", self.project_path)
+        
+        if self._is_large_tree():
+            return self.iter_files_parallel()
+        return self.iter_files()
+    
+    def scan_parallel(self, max_workers: int = 8) -> List[Path]:
+        """
+        Scan the project directory, listing subdirectories concurrently.
+        
+        Useful on network mounts and cold caches, where each directory
+        listing is dominated by I/O latency.
+        
+        Args:
+            max_workers: Maximum number of directories listed at once
+            
+        Returns:
+            Sorted list of Path objects for code files found
+        """
+        return sorted(self.iter_files_parallel(max_workers))
+    
+    def iter_files_parallel(self, max_workers: int = 8) -> Iterator[Path]:
+        """
+        Yield code files while listing subdirectories concurrently.
+        
+        Args:
+            max_workers: Maximum number of directories listed at once
+            
+        Yields:
+            Path objects for code files, in completion order
+        """
+        skipped = 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(self._scan_directory, str(self.project_path))}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        subdirs, files, skipped_here = future.result()
+                        skipped += skipped_here
+                        pending.update(executor.submit(self._scan_directory, subdir) for subdir in subdirs)
+                        yield from files
+            finally:
+                for future in pending:
+                    future.cancel()
+        
+        self._log_skipped(skipped)
+    
+    def iter_files(self) -> Iterator[Path]:
+        """
+        Walk the project directory breadth-first and yield code files as they are found.
+        
+        Yields:
+            Path objects for code files
+        """
+        pending = deque([str(self.project_path)])
+        skipped = 0
+        
+        while pending:
+            subdirs, files, skipped_here = self._scan_directory(pending.popleft())
+            pending.extend(subdirs)
+            skipped += skipped_here
+            yield from files
+        
+        self._log_skipped(skipped)
+    
+    def _is_large_tree(self) -> bool:
+        """
+        Check whether the project root is big enough to benefit from a parallel scan.
+        
+        Returns:
+            True if the root has at least PARALLEL_SCAN_THRESHOLD entries
+        """
+        with os.scandir(self.project_path) as entries:
+            root_entries = sum(1 for _ in entries)
+        return root_entries >= self.PARALLEL_SCAN_THRESHOLD
+    
+    def _scan_directory(self, directory: str) -> Tuple[List[str], List[Path], int]:
+        """
+        List a single directory.
+        
+        Minified or bundled JavaScript and files larger than MAX_SOURCE_BYTES
+        are skipped, since they are not worth a model request.
+        
+        Args:
+            directory: Directory to list
+            
+        Returns:
+            Tuple of (subdirectories to descend into, code files found, number of files skipped)
+        """
+        extensions = _EXT_TO_LANG
+        excluded_dirs = self.EXCLUDED_DIRS
+        excluded_fragments = self.EXCLUDED_SUFFIX_FRAGMENTS
+        max_bytes = self.MAX_SOURCE_BYTES
+        debug = logger.isEnabledFor(logging.DEBUG)
+        subdirs = []
+        files = []
+        skipped = 0
+        
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in excluded_dirs:
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in extensions:
+                        try:
+                            if name.lower().endswith(excluded_fragments) or entry.stat().st_size > max_bytes:
+                                skipped += 1
+                                continue
+                        except OSError:
+                            continue
+                        file_path = Path(entry.path)
+                        if debug:
+                            logger.debug("Found code file: %s", file_path.relative_to(self.project_path))
+                        files.append(file_path)
+        except OSError as e:
+            logger.warning("Could not read directory %s: %s", directory, e)
+        
+        return subdirs, files, skipped
+    
+    def _log_skipped(self, skipped: int):
+        """
+        Log how many candidate files were skipped during a scan.
+        
+        Args:
+            skipped: Number of skipped files
+        """
+        if skipped:
+            logger.info("Skipped %d minified or oversized files", skipped)
+    
     def get_file_content(self, file_path: Path) -> str:
         """
         Read and return the content of a file.
         
+        Files of MMAP_MIN_BYTES or more are memory-mapped and decoded straight
+        from the mapping; invalid UTF-8 sequences are replaced.
+        
         Args:
             file_path: Path to the file
             
         Returns:
             Content of the file as string
+            
+        Raises:
+            ValueError: If the file is larger than MAX_FILE_BYTES
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            logger.warning(f"Could not decode file {file_path}, trying with latin-1 encoding")
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > self.MAX_FILE_BYTES:
+                raise ValueError(f"File too large to analyze ({size} bytes): {file_path}")
+            
+            if size < self.MMAP_MIN_BYTES:
+                return f.read().decode('utf-8', errors='replace')
+            
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, 'utf-8', 'replace')
     
     def get_language(self, file_path: Path) -> str:
         """
@@ -77,22 +281,4 @@ class CodeScanner:
         Returns:
             Language name as string
         """
-        extension_map = {
-            '.py': 'Python',
-            '.java': 'Java',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.jsx': 'JavaScript React',
-            '.tsx': 'TypeScript React',
-            '.go': 'Go',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.cpp': 'C++',
-            '.c': 'C',
-            '.cs': 'C#',
-            '.swift': 'Swift',
-            '.kt': 'Kotlin',
-            '.rs': 'Rust',
-            '.scala': 'Scala'
-        }
-        return extension_map.get(file_path.suffix.lower(), 'Unknown')
+        return get_language_from_suffix(file_path.suffix)
@@ -19,8 +19,14 @@ setup(
         "google-adk>=0.1.0",
         "fastapi>=0.104.0",
         "uvicorn>=0.24.0",
+        "uvloop>=0.19.0; sys_platform != 'win32'",
+        "httptools>=0.6.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        "pygit2": ["pygit2>=1.12"],
+        "blake3": ["blake3>=0.3"],
+    },
     entry_points={
         "console_scripts": [
             "sentinel-agent=sentinel_agent.cli:main",
@@ -0,0 +1,209 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+import analyzer
+from analyzer import BATCH_DELIMITER, MIN_CACHE_TOKENS, SYSTEM_INSTRUCTION, AnalysisCache, AnalysisResult, CodeAnalyzer, _strip_python
+
+
+def compress(content, language='Python'):
+    analyzer = CodeAnalyzer.__new__(CodeAnalyzer)
+    analyzer.compress = True
+    return analyzer._compress(content, language)
+
+
+def test_strip_python_removes_comments_and_docstrings():
+    content = 'def f():\n    """doc"""\n    return 1  # one\n'
+    assert _strip_python(content) == 'def f():\n    \n    return 1  \n'
+
+
+def test_strip_python_keeps_form_feed_lines():
+    content = '\x0cdef f():\n    """doc"""\n    return 1\n'
+    assert _strip_python(content) == '\x0cdef f():\n    \n    return 1\n'
+
+
+def test_strip_python_keeps_unicode_line_separators():
+    content = 'x = "a\u2028b"  # hi\ny = 2 # c\n'
+    result = _strip_python(content)
+    assert 'x = "a\u2028b"' in result
+    assert 'y = 2' in result
+    assert '# hi' not in result and '# c' not in result
+
+
+@pytest.mark.parametrize('content', [
+    '\x0cdef f():\n    """doc"""\n    return 1\n',
+    'x = 1  # a\x0cb\ndef f():\n    """doc"""\n',
+    'x = "a\u2028b"  # hi\ny = 2 # c\n',
+    'a = 1\x1c\nb = "\x85"  # c\n',
+])
+def test_compress_preserves_line_count(content):
+    result = compress(content)
+    assert result.count('\n') == content.count('\n')
+
+
+def test_compress_falls_back_on_untokenizable_code():
+    content = 'def f(:\n    return 1   \n'
+    assert compress(content) == 'def f(:\n    return 1\n'
+
+
+def batch_response(*bodies):
+    return '\n'.join(
+        f"{BATCH_DELIMITER.format(index=index)}\n{body}"
+        for index, body in enumerate(bodies, 1)
+    )
+
+
+def test_split_batch_response_orders_sections():
+    text = batch_response('first', 'second')
+    assert CodeAnalyzer._split_batch_response(text, 2) == ['first', 'second']
+
+
+def test_split_batch_response_ignores_preamble():
+    text = 'Here you go:\n' + batch_response('first', 'second')
+    assert CodeAnalyzer._split_batch_response(text, 2) == ['first', 'second']
+
+
+@pytest.mark.parametrize('text, expected', [
+    (batch_response('only one'), 2),
+    (batch_response('first', 'second', 'third'), 2),
+    (batch_response('first', ''), 2),
+    (batch_response('first') + '\n' + BATCH_DELIMITER.format(index=1) + '\nagain', 1),
+    ('no delimiters at all', 1),
+])
+def test_split_batch_response_rejects_malformed(text, expected):
+    with pytest.raises(ValueError):
+        CodeAnalyzer._split_batch_response(text, expected)
+
+
+def test_analysis_cache_separates_variants(tmp_path):
+    cache = AnalysisCache(tmp_path / 'cache.sqlite')
+    result = AnalysisResult('a.py', 'a.py', 'Python', 'success', 'ok')
+    content_hash = AnalysisCache.content_hash('x = 1\n', 'Python')
+    cache.put('model:compressed', [(content_hash, result)])
+    assert cache.get(content_hash, 'model:compressed') == result
+    assert cache.get(content_hash, 'model:verbatim') is None
+
+
+def test_system_instruction_is_long_enough_to_cache():
+    assert len(SYSTEM_INSTRUCTION) >= MIN_CACHE_TOKENS * 3
+
+
+class FakeCachedContent:
+    live = []
+    
+    def __init__(self, display_name, model):
+        self.name = f"cachedContents/{len(self.live)}"
+        self.display_name = display_name
+        self.model = model
+        self.updates = 0
+    
+    @classmethod
+    def create(cls, model, display_name, system_instruction, ttl):
+        cache = cls(display_name, f"models/{model}")
+        cls.live.append(cache)
+        return cache
+    
+    @classmethod
+    def list(cls):
+        return list(cls.live)
+    
+    def update(self, ttl):
+        self.updates += 1
+
+
+@pytest.fixture
+def fake_caching(monkeypatch):
+    FakeCachedContent.live = []
+    monkeypatch.setattr(analyzer.caching, 'CachedContent', FakeCachedContent)
+    monkeypatch.setattr(analyzer, '_instruction_is_cacheable', lambda: True)
+    monkeypatch.setattr(analyzer, '_cached_content', None)
+    monkeypatch.setattr(analyzer, '_cache_supported', None)
+    return FakeCachedContent
+
+
+def test_get_cached_content_creates_and_memoizes(fake_caching):
+    cache = analyzer.get_cached_content()
+    assert cache.display_name == analyzer.CACHE_DISPLAY_NAME
+    assert analyzer.get_cached_content() is cache
+    assert len(fake_caching.live) == 1
+
+
+def test_get_cached_content_reuses_cache_from_earlier_run(fake_caching):
+    earlier = fake_caching.create(analyzer.MODEL_NAME, analyzer.CACHE_DISPLAY_NAME, SYSTEM_INSTRUCTION, None)
+    assert analyzer.get_cached_content() is earlier
+    assert earlier.updates == 1
+
+
+def test_get_cached_content_replaces_expired_cache(fake_caching):
+    expired = analyzer.get_cached_content()
+    replacement = analyzer.get_cached_content(expired=expired)
+    assert replacement is not expired
+    assert analyzer.get_cached_content(expired=expired) is replacement
+
+
+def test_generate_recreates_expired_cache(fake_caching, monkeypatch):
+    class ExpiredModel:
+        async def generate_content_async(self, prompt):
+            raise analyzer.google_exceptions.NotFound("cached content not found")
+    
+    class FreshModel:
+        async def generate_content_async(self, prompt):
+            return 'ok'
+    
+    code_analyzer = CodeAnalyzer.__new__(CodeAnalyzer)
+    code_analyzer.cached_content = expired = analyzer.get_cached_content()
+    code_analyzer.model = ExpiredModel()
+    
+    def create_model(expired_cache=None):
+        code_analyzer.cached_content = analyzer.get_cached_content(expired=expired_cache)
+        return FreshModel()
+    
+    monkeypatch.setattr(code_analyzer, '_create_model', create_model)
+    assert asyncio.run(code_analyzer._generate('prompt')) == 'ok'
+    assert code_analyzer.cached_content is not expired
+
+
+class RejectingModel:
+    
+    def __init__(self, error):
+        self.error = error
+        self.prompts = []
+    
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        if 'bad.py' in prompt:
+            raise self.error
+        
+        class Response:
+            text = 'single ok'
+        return Response()
+
+
+def batch_analyzer(model):
+    code_analyzer = CodeAnalyzer.__new__(CodeAnalyzer)
+    code_analyzer.compress = False
+    code_analyzer.cached_content = None
+    code_analyzer.model = model
+    return code_analyzer
+
+
+def test_request_batch_retries_files_after_bad_request(tmp_path):
+    model = RejectingModel(analyzer.google_exceptions.InvalidArgument("request too large"))
+    items = [(tmp_path / name, 'x = 1\n', 'Python') for name in ('good.py', 'bad.py', 'other.py')]
+    
+    results = asyncio.run(batch_analyzer(model)._request_batch(items))
+    
+    assert [result.status for result in results] == ['success', 'error', 'success']
+    assert len(model.prompts) == 4
+
+
+def test_request_batch_does_not_retry_auth_errors(tmp_path):
+    model = RejectingModel(analyzer.google_exceptions.Unauthenticated("bad key"))
+    items = [(tmp_path / name, 'x = 1\n', 'Python') for name in ('good.py', 'bad.py')]
+    
+    results = asyncio.run(batch_analyzer(model)._request_batch(items))
+    
+    assert [result.status for result in results] == ['error', 'error']
+    assert len(model.prompts) == 1
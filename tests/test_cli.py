@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+pytest.importorskip("dotenv")
+
+import cli
+from analyzer import AnalysisResult
+from scanner import CodeScanner
+
+
+class CountingScanner(CodeScanner):
+    __slots__ = ('reads',)
+    
+    def __init__(self, project_path):
+        super().__init__(project_path)
+        self.reads = 0
+    
+    def get_file_content(self, file_path):
+        self.reads += 1
+        return super().get_file_content(file_path)
+
+
+class SlowAnalyzer:
+    
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.reads_at_first_result = None
+    
+    async def analyze_batch(self, items):
+        await asyncio.sleep(0.05)
+        if self.reads_at_first_result is None:
+            self.reads_at_first_result = self.scanner.reads
+        return [AnalysisResult(str(path), path.name, language, 'success', 'ok') for path, _, language in items]
+
+
+class NullReporter:
+    
+    def generate_file_report(self, analysis_result):
+        pass
+
+
+def test_analyze_files_applies_backpressure(tmp_path):
+    for number in range(200):
+        (tmp_path / f"module_{number}.py").write_text(f"x = {number}\n")
+    scanner = CountingScanner(tmp_path)
+    analyzer = SlowAnalyzer(scanner)
+    
+    results = asyncio.run(cli.analyze_files(
+        scanner, analyzer, NullReporter(), scanner.stream(), batch_size=4, concurrency=2
+    ))
+    
+    assert len(results) == 200
+    assert all(result.status == 'success' for result in results)
+    assert analyzer.reads_at_first_result <= 2 * 4 + 4
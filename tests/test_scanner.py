@@ -0,0 +1,56 @@
+import pytest
+
+from scanner import CodeScanner
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        'app.py': 'x = 1\n',
+        'src/main.go': 'package main\n',
+        'src/util.JS': 'var a;\n',
+        'src/..py': 'y = 2\n',
+        '.py': 'secret = 1\n',
+        'src/.c': 'int x;\n',
+        'static/app.min.js': 'var a;\n',
+        'static/app.bundle.js': 'var a;\n',
+        'vendor/lib.py': 'z = 3\n',
+        'node_modules/pkg/index.js': 'var b;\n',
+        'README.md': '# readme\n',
+        'notes.': 'n\n',
+    }
+    for relative_path, content in files.items():
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (tmp_path / 'big.py').write_text('x = 1\n' * (CodeScanner.MAX_SOURCE_BYTES // 6 + 1))
+    return tmp_path
+
+
+def relative_names(project, paths):
+    return sorted(path.relative_to(project).as_posix() for path in paths)
+
+
+EXPECTED = ['app.py', 'src/..py', 'src/main.go', 'src/util.JS']
+
+
+def test_scan_finds_code_files_and_applies_skip_rules(project):
+    assert relative_names(project, CodeScanner(project).scan()) == EXPECTED
+
+
+def test_walk_strategies_agree(project):
+    scanner = CodeScanner(project)
+    assert relative_names(project, scanner.iter_files()) == EXPECTED
+    assert relative_names(project, scanner.iter_files_parallel(max_workers=2)) == EXPECTED
+    assert relative_names(project, scanner.scan_parallel(max_workers=2)) == EXPECTED
+
+
+@pytest.mark.parametrize('name', ['.py', '.c', '.go'])
+def test_dotfiles_named_after_an_extension_are_skipped(tmp_path, name):
+    (tmp_path / name).write_text('x\n')
+    assert CodeScanner(tmp_path).scan() == []
+
+
+def test_scanned_files_have_a_known_language(project):
+    scanner = CodeScanner(project)
+    assert all(scanner.get_language(path) != 'Unknown' for path in scanner.scan())